@@ -5,8 +5,8 @@ A Python package for calculating annual greenhouse gas emissions from various op
 """
 
 from .data_loader import load_data_from_directory
-from .lookup import lookup
+from .lookup import lookup, build_index
 from .emissions_calculator import calculate_annual_emissions
 
 __version__ = "0.1.0"
-__all__ = ['load_data_from_directory', 'lookup', 'calculate_annual_emissions']
+__all__ = ['load_data_from_directory', 'lookup', 'build_index', 'calculate_annual_emissions']
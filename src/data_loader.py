@@ -4,17 +4,89 @@ Data loading utilities for the emissions calculator.
 This module provides functions to load CSV files from a directory into pandas DataFrames.
 """
 
-import pandas as pd
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Prefer Arrow's multithreaded CSV parser when pyarrow is installed; the
+# default C engine remains the fallback so pyarrow stays an optional dependency
+try:
+    import pyarrow  # noqa: F401
+    _HAVE_PYARROW = True
+except ImportError:
+    _HAVE_PYARROW = False
+
+_CSV_READ_KWARGS = {'engine': 'pyarrow'} if _HAVE_PYARROW else {}
+
+# Low-cardinality string columns used as lookup/join keys. Casting them to
+# category turns repeated string equality checks into integer comparisons and
+# shrinks the loaded frames
+_CATEGORICAL_COLUMNS = frozenset({
+    'entity', 'fuel_type', 'fuel_mode', 'state_or_province', 'country',
+    'refrigerator_type', 'refrigerant_type',
+    'vehicle_category', 'vehicle_subcategory', 'vehicle_manufacturer',
+    'tru_category', 'tru_subcategory', 'tru_type', 'tru_refrigerant_type',
+    'category', 'subcategory', 'livestock_type', 'fertilizer_type', 'waste_type',
+})
+
+
+def _read_csv_file(filepath, cache_dir=None):
+    """
+    Read a single CSV file, returning None if it cannot be loaded.
+
+    When cache_dir is given and the CSV has an up-to-date Parquet copy there,
+    the Parquet file is read instead (5-20x faster, dtypes preserved); after a
+    CSV parse the cache is refreshed. Runs inside the loader's thread pool, so
+    per-file errors are logged and swallowed here rather than aborting the
+    whole directory load.
+    """
+    filename = os.path.basename(filepath)
+    key = os.path.splitext(filename)[0]
+    cached_path = os.path.join(cache_dir, f'{key}.parquet') if cache_dir else None
+    try:
+        if (cached_path and os.path.exists(cached_path)
+                and os.path.getmtime(cached_path) >= os.path.getmtime(filepath)):
+            try:
+                df = pd.read_parquet(cached_path)
+                logger.debug("Loaded '%s' from parquet cache", filename)
+                return df
+            except Exception as e:
+                logger.warning("Could not read cache for '%s' (%s); re-parsing CSV.",
+                               filename, e)
+        df = pd.read_csv(filepath, **_CSV_READ_KWARGS)
+        for col in df.columns.intersection(_CATEGORICAL_COLUMNS):
+            df[col] = df[col].astype('category')
+        if cached_path:
+            try:
+                df.to_parquet(cached_path)
+            except Exception as e:
+                logger.debug("Could not write parquet cache for '%s': %s", filename, e)
+        logger.debug("Successfully loaded '%s'", filename)
+        return df
+    except pd.errors.EmptyDataError:
+        logger.warning("'%s' is empty. Skipping.", filename)
+    except pd.errors.ParserError:
+        logger.warning("Could not parse '%s'. Skipping.", filename)
+    except Exception as e:
+        logger.warning("An unexpected error occurred while reading '%s': %s", filename, e)
+    return None
 
 
-def load_data_from_directory(csv_dir):
+def load_data_from_directory(csv_dir, use_cache=True):
     """
     Load all CSV files from a directory into a dictionary of DataFrames.
-    
+
     Args:
         csv_dir (str): Path to the directory containing CSV files.
-    
+        use_cache (bool): When True (and pyarrow is installed), keep Parquet
+                          copies of the CSVs in a sibling 'cache' directory and
+                          load from there while they are newer than the CSVs.
+
     Returns:
         dict: Dictionary where keys are filenames (without extension) and 
               values are pandas DataFrames.
@@ -25,32 +97,35 @@ def load_data_from_directory(csv_dir):
         dict_keys(['fuel_data', 'refrigerant_gwp', ...])
     """
     dataframes = {}
-    
+
     # Check if directory exists
     if not os.path.exists(csv_dir):
         raise FileNotFoundError(f"Directory '{csv_dir}' not found.")
-    
-    # Iterate over files in the directory
-    for filename in os.listdir(csv_dir):
-        if filename.endswith('.csv'):
-            filepath = os.path.join(csv_dir, filename)
-            try:
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(filepath)
-                
-                # Use the filename (without extension) as the key
-                key = os.path.splitext(filename)[0]
-                dataframes[key] = df
-                print(f"Successfully loaded '{filename}' into dataframe '{key}'")
-                
-            except pd.errors.EmptyDataError:
-                print(f"Warning: '{filename}' is empty. Skipping.")
-            except pd.errors.ParserError:
-                print(f"Warning: Could not parse '{filename}'. Skipping.")
-            except Exception as e:
-                print(f"An unexpected error occurred while reading '{filename}': {e}")
-    
+
+    # Collect the CSV files, then parse them concurrently; CSV parsing releases
+    # the GIL in pandas' C parser, so threads overlap both I/O and parsing
+    # scandir's DirEntry objects carry cached stat info, so filtering to
+    # regular CSV files costs no extra stat syscalls
+    with os.scandir(csv_dir) as entries:
+        csv_entries = [e for e in entries if e.is_file() and e.name.endswith('.csv')]
+    filenames = [e.name for e in csv_entries]
+    filepaths = [e.path for e in csv_entries]
+
+    cache_dir = None
+    if use_cache and _HAVE_PYARROW:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_dir)), 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    if filepaths:
+        read_file = partial(_read_csv_file, cache_dir=cache_dir)
+        with ThreadPoolExecutor(max_workers=min(8, len(filepaths))) as executor:
+            for filename, df in zip(filenames, executor.map(read_file, filepaths)):
+                if df is not None:
+                    # Use the filename (without extension) as the key
+                    key = os.path.splitext(filename)[0]
+                    dataframes[key] = df
+
     if not dataframes:
-        print(f"Warning: No CSV files found in '{csv_dir}'")
-    
+        logger.warning("No CSV files found in '%s'", csv_dir)
+
     return dataframes
@@ -10,20 +10,130 @@ This module calculates annual CO2-equivalent emissions from various sources incl
 """
 
 import pandas as pd
+import numpy as np
 import datetime
 from .lookup import lookup
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Operation columns that feed the arithmetic kernel; coerced to numeric in one
+# bulk pass with non-numeric entries treated as zero
+NUMERIC_COLS = [
+    'fuel_amount', 'refrigerant_charge', 'number_of_refrigerators',
+    'operating_distance', 'tru_number_of_vehicle_units', 'tru_refrigerant_charge',
+    'livestock_count', 'fertilizer_amount', 'waste_amount'
+]
+
+
+def _emissions_kernel(fuel_amount, fuel_ef_forecast, fuel_ef_current,
+                      operating_distance, vehicle_fuel_efficiency,
+                      refrigerant_charge, annual_leakage_rate, refrigerant_gwp_value,
+                      number_of_refrigerators,
+                      livestock_count, emission_per_unit_livestock,
+                      fertilizer_amount, emission_per_unit_fertilizer,
+                      waste_amount, emission_per_unit_waste,
+                      tru_power_rating, average_tru_load_factor, tru_annual_hours,
+                      tru_plug_in_fraction_of_hours, emission_factor_diesel_tru,
+                      tru_refrigerant_gwp_value, tru_refrigerant_charge,
+                      tru_annual_leakage_rate, tru_number_of_vehicle_units):
+    """
+    Compute all emissions columns from aligned float64 arrays.
+
+    Written as plain numpy array expressions so the same function runs
+    unchanged with or without numba; when numba is installed it is compiled
+    into a fused parallel loop over all rows (see module bottom).
+    """
+    average_fuel_emission_factor = (fuel_ef_forecast + fuel_ef_current) / 2.0
+
+    fuel_emissions = fuel_amount * average_fuel_emission_factor
+
+    # Guard the divisor so rows without an efficiency entry contribute zero
+    has_efficiency = vehicle_fuel_efficiency != 0.0
+    safe_efficiency = np.where(has_efficiency, vehicle_fuel_efficiency, 1.0)
+    vehicle_emissions = np.where(
+        has_efficiency,
+        operating_distance / safe_efficiency * average_fuel_emission_factor,
+        0.0)
+
+    refrigerant_emissions = (refrigerant_charge * annual_leakage_rate *
+                             refrigerant_gwp_value * number_of_refrigerators)
+
+    livestock_emissions = livestock_count * emission_per_unit_livestock
+
+    fertilizer_emissions = fertilizer_amount * emission_per_unit_fertilizer
+
+    waste_emissions = waste_amount * emission_per_unit_waste
+
+    tru_emissions = ((tru_power_rating * average_tru_load_factor * tru_annual_hours *
+                      tru_plug_in_fraction_of_hours * emission_factor_diesel_tru) +
+                     (tru_refrigerant_gwp_value * tru_refrigerant_charge *
+                      tru_annual_leakage_rate)) * tru_number_of_vehicle_units
+
+    total_emissions = (fuel_emissions + vehicle_emissions + refrigerant_emissions +
+                       livestock_emissions + fertilizer_emissions + waste_emissions +
+                       tru_emissions)
+
+    return (fuel_emissions, vehicle_emissions, refrigerant_emissions,
+            livestock_emissions, fertilizer_emissions, waste_emissions,
+            tru_emissions, total_emissions)
+
+
+if njit is not None:
+    _emissions_kernel = njit(parallel=True, fastmath=True, cache=True)(_emissions_kernel)
+
+
+def _first_match(df, keys):
+    """
+    Keep only the first row per key combination.
+
+    Mirrors the take-the-first-match semantics of lookup() so that the
+    vectorized joins below return exactly one value per operation row.
+    """
+    return df.drop_duplicates(subset=keys, keep='first')
+
+
+def _map_or_zero(keys, reference_values):
+    """
+    Map per-row keys to reference values, defaulting to 0.
+
+    Skips the join entirely when no row carries a usable key, which is common
+    for sparse operation files where each row uses only a couple of emission
+    sources.
+    """
+    if keys.notna().any():
+        return keys.map(reference_values).fillna(0)
+    return pd.Series(0.0, index=keys.index)
+
+
+def _merge_or_zero(rows, reference, left_on, right_on, value_cols):
+    """
+    Left-join reference values onto the operation rows, defaulting to 0.
+
+    One batched hash join per reference table replaces what used to be a
+    lookup() scan per operation row. Like _map_or_zero, the join is skipped
+    when no row carries a usable primary key.
+    """
+    if rows[left_on[0]].notna().any():
+        merged = rows[left_on].merge(
+            reference[right_on + value_cols], how='left',
+            left_on=left_on, right_on=right_on)[value_cols].fillna(0)
+        return merged.set_axis(rows.index)
+    return pd.DataFrame(0.0, index=rows.index, columns=value_cols)
+
 
 def calculate_annual_emissions(operation_data, fuel_data, refrigerant_gwp, refrigerator_data,
                                vehicle_interventions, vehicle_interventions_tru, farm_emissions):
     """
     Calculates annual emissions for each operation_id in operation_data.
-    
+
     This function performs three main stages:
-    1. Lookup secondary data using the generic lookup function
-    2. Pre-process data with numeric conversion and error handling
-    3. Calculate emissions from all applicable sources
-    
+    1. Attach secondary data with vectorized joins against the reference tables
+    2. Pre-process data with bulk numeric conversion and error handling
+    3. Calculate all emissions columns with vectorized Series arithmetic
+
     Args:
         operation_data (pd.DataFrame): DataFrame with operation data including:
             - operation_id, entity, fuel_type, fuel_amount, operating_distance
@@ -38,7 +148,7 @@ def calculate_annual_emissions(operation_data, fuel_data, refrigerant_gwp, refri
         vehicle_interventions (pd.DataFrame): Vehicle fuel efficiency data.
         vehicle_interventions_tru (pd.DataFrame): TRU specifications and emission factors.
         farm_emissions (pd.DataFrame): Agricultural emission factors.
-    
+
     Returns:
         pd.DataFrame: DataFrame with columns:
             - operation_id
@@ -50,7 +160,7 @@ def calculate_annual_emissions(operation_data, fuel_data, refrigerant_gwp, refri
             - waste_emissions
             - tru_emissions
             - total_emissions
-    
+
     Example:
         >>> results = calculate_annual_emissions(
         ...     operation_data=ops_df,
@@ -63,197 +173,168 @@ def calculate_annual_emissions(operation_data, fuel_data, refrigerant_gwp, refri
         ... )
         >>> print(results[['operation_id', 'total_emissions']])
     """
-    results = []
-    errors = []
-    
-    for _, row in operation_data.iterrows():
-        
-        # ===== STAGE 1: LOOKUP SECONDARY DATA =====
-        
-        # Refrigerator leakage rate
-        annual_leakage_rate = lookup(
-            refrigerator_data,
-            {'refrigerator_type': row['refrigerator_type']},
-            output_columns=['annual_leakage_rate']
-        )
-        annual_leakage_rate = annual_leakage_rate[0]['annual_leakage_rate'] if annual_leakage_rate else 0
-        
-        # Refrigerant GWP
-        refrigerant_gwp_value = lookup(
-            refrigerant_gwp,
-            {'refrigerant_type': row['refrigerant_type']},
-            output_columns=['refrigerant_gwp']
-        )
-        refrigerant_gwp_value = refrigerant_gwp_value[0]['refrigerant_gwp'] if refrigerant_gwp_value else 0
-        
-        # TRU leakage rate
-        tru_annual_leakage_rate = lookup(
-            refrigerator_data,
-            {'refrigerator_type': 'Transportation Refrigeration Unit'},
-            output_columns=['annual_leakage_rate']
-        )
-        tru_annual_leakage_rate = tru_annual_leakage_rate[0]['annual_leakage_rate'] if tru_annual_leakage_rate else 0
-        
-        # TRU refrigerant GWP
-        tru_refrigerant_gwp_value = lookup(
-            refrigerant_gwp,
-            {'refrigerant_type': row['tru_refrigerant_type']},
-            output_columns=['refrigerant_gwp']
-        )
-        tru_refrigerant_gwp_value = tru_refrigerant_gwp_value[0]['refrigerant_gwp'] if tru_refrigerant_gwp_value else 0
-        
-        # TRU specifications
-        tru_data = lookup(
-            vehicle_interventions_tru,
-            {'tru_type': row['tru_subcategory'],
-             'model_year': row['tru_model_year']},
-            output_columns=['co2e_per_kwh_diesel_tru', 'tru_power_rating',
-                           'average_load_factor', 'tru_annual_hours',
-                           'tru_plug_in_fraction_of_hours']
-        )
-        emission_factor_diesel_tru = tru_data[0]['co2e_per_kwh_diesel_tru'] if tru_data else 0
-        tru_power_rating = tru_data[0]['tru_power_rating'] if tru_data else 0
-        average_tru_load_factor = tru_data[0]['average_load_factor'] if tru_data else 0
-        tru_annual_hours = tru_data[0]['tru_annual_hours'] if tru_data else 0
-        tru_plug_in_fraction_of_hours = tru_data[0]['tru_plug_in_fraction_of_hours'] if tru_data else 0
-        
-        # Livestock emissions
-        emission_per_unit_livestock = lookup(
-            farm_emissions,
-            {'subcategory': row['livestock_type']},
-            output_columns=['emission_per_unit']
-        )
-        emission_per_unit_livestock = emission_per_unit_livestock[0]['emission_per_unit'] if emission_per_unit_livestock else 0
-        
-        # Fertilizer emissions
-        emission_per_unit_fertilizer = lookup(
-            farm_emissions,
-            {'subcategory': row['fertilizer_type']},
-            output_columns=['emission_per_unit']
-        )
-        emission_per_unit_fertilizer = emission_per_unit_fertilizer[0]['emission_per_unit'] if emission_per_unit_fertilizer else 0
-        
-        # Waste emissions
-        emission_per_unit_waste = lookup(
-            farm_emissions,
-            {'subcategory': row['waste_type']},
-            output_columns=['emission_per_unit']
-        )
-        emission_per_unit_waste = emission_per_unit_waste[0]['emission_per_unit'] if emission_per_unit_waste else 0
-        
-        # Vehicle fuel efficiency with fallbacks
-        vehicle_fuel_efficiency = lookup(
-            vehicle_interventions,
-            {'vehicle_subcategory': row['vehicle_subcategory'], 
-             'fuel_type': row['fuel_type'],
-             'vehicle_production_year': row['vehicle_production_year'], 
-             'vehicle_manufacturer': row['vehicle_manufacturer']},
-            output_columns=['fuel_efficiency'],
-            fallback_criteria=[
-                {'vehicle_production_year': 0}, 
-                {'vehicle_manufacturer': 'Others'},
-                {'vehicle_production_year': 0, 'vehicle_manufacturer': 'Others'}
-            ]
-        )
-        vehicle_fuel_efficiency = vehicle_fuel_efficiency[0]['fuel_efficiency'] if vehicle_fuel_efficiency else 0
-        
-        # Fuel emission factors
-        fuel_mode = 'mobile' if row['entity'] == 'vehicle' and row['fuel_type'] != 'Electricity' else 'stationary'
-        target_year_co2e = f'co2e_{row["target_completion_year"]}'
-        current_year = datetime.datetime.now().year
-        current_year_co2e = f'co2e_{current_year}'
-        
-        fuel_emission_factors = lookup(
-            fuel_data,
-            {'fuel_type': row['fuel_type'], 
-             'fuel_mode': fuel_mode,
-             'state_or_province': row['state_or_province']},
-            output_columns=[current_year_co2e, target_year_co2e],
-            fallback_criteria=[{'state_or_province': 'Any'}]
-        )
-        fuel_emission_factor_current = fuel_emission_factors[0].get(current_year_co2e, 0) if fuel_emission_factors else 0
-        
-        if row["target_completion_year"] == current_year and len(fuel_emission_factors) == 1:
-            fuel_emission_factor_forecast = fuel_emission_factor_current
-        else:
-            fuel_emission_factor_forecast = fuel_emission_factors[0].get(target_year_co2e, 0) if fuel_emission_factors else 0
-        
-        
-        # ===== STAGE 2: PRE-PROCESS DATA =====
-        
-        fuel_amount = pd.to_numeric(row['fuel_amount'], errors='coerce')
-        fuel_amount = fuel_amount if not pd.isna(fuel_amount) else 0
-        
-        refrigerant_charge = pd.to_numeric(row['refrigerant_charge'], errors='coerce')
-        refrigerant_charge = refrigerant_charge if not pd.isna(refrigerant_charge) else 0
-        
-        number_of_refrigerators = pd.to_numeric(row['number_of_refrigerators'], errors='coerce')
-        number_of_refrigerators = number_of_refrigerators if not pd.isna(number_of_refrigerators) else 0
-        
-        operating_distance = pd.to_numeric(row['operating_distance'], errors='coerce')
-        operating_distance = operating_distance if not pd.isna(operating_distance) else 0
-        
-        tru_number_of_vehicle_units = pd.to_numeric(row['tru_number_of_vehicle_units'], errors='coerce')
-        tru_number_of_vehicle_units = tru_number_of_vehicle_units if not pd.isna(tru_number_of_vehicle_units) else 0
-        
-        tru_refrigerant_charge = pd.to_numeric(row['tru_refrigerant_charge'], errors='coerce')
-        tru_refrigerant_charge = tru_refrigerant_charge if not pd.isna(tru_refrigerant_charge) else 0
-        
-        livestock_count = pd.to_numeric(row['livestock_count'], errors='coerce')
-        livestock_count = livestock_count if not pd.isna(livestock_count) else 0
-        
-        fertilizer_amount = pd.to_numeric(row['fertilizer_amount'], errors='coerce')
-        fertilizer_amount = fertilizer_amount if not pd.isna(fertilizer_amount) else 0
-        
-        waste_amount = pd.to_numeric(row['waste_amount'], errors='coerce')
-        waste_amount = waste_amount if not pd.isna(waste_amount) else 0
-        
-        
-        # ===== STAGE 3: CALCULATE EMISSIONS =====
-        
-        fuel_emissions = fuel_amount * ((fuel_emission_factor_forecast + fuel_emission_factor_current)) / 2
-        
-        vehicle_emissions = (operating_distance / vehicle_fuel_efficiency * 
-                            ((fuel_emission_factor_forecast + fuel_emission_factor_current) / 2)) if vehicle_fuel_efficiency else 0
-        
-        refrigerant_emissions = (refrigerant_charge * annual_leakage_rate * 
-                                refrigerant_gwp_value * number_of_refrigerators)
-        
-        livestock_emissions = livestock_count * emission_per_unit_livestock
-        
-        fertilizer_emissions = fertilizer_amount * emission_per_unit_fertilizer
-        
-        waste_emissions = waste_amount * emission_per_unit_waste
-        
-        tru_emissions = ((tru_power_rating * average_tru_load_factor * tru_annual_hours * 
-                         tru_plug_in_fraction_of_hours * emission_factor_diesel_tru) + 
-                        (tru_refrigerant_gwp_value * tru_refrigerant_charge * 
-                         tru_annual_leakage_rate)) * tru_number_of_vehicle_units
-        
-        total_emissions = (fuel_emissions + vehicle_emissions + refrigerant_emissions + 
-                          livestock_emissions + fertilizer_emissions + waste_emissions + 
-                          tru_emissions)
-        
-        results.append({
-            'operation_id': row['operation_id'],
-            'fuel_emissions': fuel_emissions,
-            'vehicle_emissions': vehicle_emissions,
-            'refrigerant_emissions': refrigerant_emissions,
-            'livestock_emissions': livestock_emissions,
-            'fertilizer_emissions': fertilizer_emissions,
-            'waste_emissions': waste_emissions,
-            'tru_emissions': tru_emissions,
-            'total_emissions': total_emissions
-        })
-    
-    annual_emission_table = pd.DataFrame(results)
-    
+    op = operation_data.copy()
+
+    # ===== STAGE 1: PRE-PROCESS DATA =====
+
+    op[NUMERIC_COLS] = op[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    # ===== STAGE 2: ATTACH SECONDARY DATA WITH VECTORIZED JOINS =====
+
+    # Refrigerator leakage rates (stationary refrigeration)
+    leakage_rates = _first_match(
+        refrigerator_data, ['refrigerator_type']
+    ).set_index('refrigerator_type')['annual_leakage_rate']
+    annual_leakage_rate = _map_or_zero(op['refrigerator_type'], leakage_rates)
+
+    # Refrigerant GWP for both stationary refrigeration and TRUs
+    gwp_values = _first_match(
+        refrigerant_gwp, ['refrigerant_type']
+    ).set_index('refrigerant_type')['refrigerant_gwp']
+    refrigerant_gwp_value = _map_or_zero(op['refrigerant_type'], gwp_values)
+    tru_refrigerant_gwp_value = _map_or_zero(op['tru_refrigerant_type'], gwp_values)
+
+    # TRU leakage rate (single constant key, computed once)
+    (tru_annual_leakage_rate,) = lookup(
+        refrigerator_data,
+        {'refrigerator_type': 'Transportation Refrigeration Unit'},
+        output_columns=['annual_leakage_rate'],
+        output_format='scalar'
+    )
+
+    # TRU specifications
+    tru_columns = ['co2e_per_kwh_diesel_tru', 'tru_power_rating', 'average_load_factor',
+                   'tru_annual_hours', 'tru_plug_in_fraction_of_hours']
+    tru_data = _merge_or_zero(
+        op, _first_match(vehicle_interventions_tru, ['tru_type', 'model_year']),
+        left_on=['tru_subcategory', 'tru_model_year'],
+        right_on=['tru_type', 'model_year'],
+        value_cols=tru_columns)
+
+    # Agricultural emission factors (livestock, fertilizers, waste)
+    farm_factors = _first_match(
+        farm_emissions, ['subcategory']
+    ).set_index('subcategory')['emission_per_unit']
+    emission_per_unit_livestock = _map_or_zero(op['livestock_type'], farm_factors)
+    emission_per_unit_fertilizer = _map_or_zero(op['fertilizer_type'], farm_factors)
+    emission_per_unit_waste = _map_or_zero(op['waste_type'], farm_factors)
+
+    # Vehicle fuel efficiency with fallbacks, applied in the same order as the
+    # original lookup: exact match first, then progressively generic keys
+    vehicle_keys = ['vehicle_subcategory', 'fuel_type',
+                    'vehicle_production_year', 'vehicle_manufacturer']
+    vehicle_efficiencies = _first_match(
+        vehicle_interventions, vehicle_keys
+    )[vehicle_keys + ['fuel_efficiency']]
+
+    def _match_vehicle_efficiency(rows, criteria_update):
+        keys = rows.assign(**criteria_update) if criteria_update else rows
+        matched = keys.merge(vehicle_efficiencies, how='left', on=vehicle_keys)['fuel_efficiency']
+        return matched.set_axis(rows.index)
+
+    if op['vehicle_subcategory'].notna().any():
+        # Each fallback level only re-probes the rows still unmatched, rather
+        # than re-joining the whole frame per level
+        vehicle_fuel_efficiency = pd.Series(np.nan, index=op.index)
+        vehicle_key_rows = op[vehicle_keys]
+        for criteria_update in [{},
+                                {'vehicle_production_year': 0},
+                                {'vehicle_manufacturer': 'Others'},
+                                {'vehicle_production_year': 0, 'vehicle_manufacturer': 'Others'}]:
+            unmatched = vehicle_fuel_efficiency.isna()
+            if not unmatched.any():
+                break
+            vehicle_fuel_efficiency[unmatched] = _match_vehicle_efficiency(
+                vehicle_key_rows.loc[unmatched], criteria_update)
+        vehicle_fuel_efficiency = vehicle_fuel_efficiency.fillna(0)
+    else:
+        vehicle_fuel_efficiency = pd.Series(0.0, index=op.index)
+
+    # Fuel emission factors, keyed by (fuel_type, fuel_mode, state_or_province)
+    # with a state-agnostic 'Any' fallback. The wide co2e_YYYY columns are
+    # melted to long form once so each row's target_completion_year becomes an
+    # ordinary join key instead of a per-row column name.
+    current_year = datetime.date.today().year
+
+    fuel_mode = np.where((op['entity'] == 'vehicle') & (op['fuel_type'] != 'Electricity'),
+                         'mobile', 'stationary')
+    fuel_keys = ['fuel_type', 'fuel_mode', 'state_or_province']
+    year_columns = [c for c in fuel_data.columns if c.startswith('co2e_')]
+    fuel_long = _first_match(fuel_data, fuel_keys).melt(
+        id_vars=fuel_keys, value_vars=year_columns, var_name='year', value_name='co2e')
+    fuel_long['year'] = fuel_long['year'].str.removeprefix('co2e_').astype(int)
+
+    def _match_fuel_factor(years):
+        keys = pd.DataFrame({
+            'fuel_type': op['fuel_type'].to_numpy(),
+            'fuel_mode': fuel_mode,
+            'state_or_province': op['state_or_province'].to_numpy(),
+            'year': years})
+        factors = keys.merge(fuel_long, how='left', on=fuel_keys + ['year'])['co2e']
+        factors = factors.set_axis(op.index)
+        missing = factors.isna()
+        if missing.any():
+            fallback_keys = keys[missing.to_numpy()].assign(state_or_province='Any')
+            fallback = fallback_keys.merge(
+                fuel_long, how='left', on=fuel_keys + ['year'])['co2e']
+            factors = factors.fillna(fallback.set_axis(op.index[missing]))
+        return factors
+
+    fuel_emission_factor_current = _match_fuel_factor(current_year)
+    fuel_emission_factor_forecast = _match_fuel_factor(op['target_completion_year'].to_numpy())
+
+    # A row only gets factors when both years resolve for its fuel record,
+    # matching the previous all-or-nothing column lookup
+    have_both_years = fuel_emission_factor_current.notna() & fuel_emission_factor_forecast.notna()
+    fuel_emission_factor_current = fuel_emission_factor_current.where(have_both_years, 0)
+    fuel_emission_factor_forecast = fuel_emission_factor_forecast.where(have_both_years, 0)
+
+    # ===== STAGE 3: CALCULATE EMISSIONS =====
+
+    def _as_float_array(series):
+        return series.to_numpy(dtype=np.float64)
+
+    (fuel_emissions, vehicle_emissions, refrigerant_emissions,
+     livestock_emissions, fertilizer_emissions, waste_emissions,
+     tru_emissions, total_emissions) = _emissions_kernel(
+        _as_float_array(op['fuel_amount']),
+        _as_float_array(fuel_emission_factor_forecast),
+        _as_float_array(fuel_emission_factor_current),
+        _as_float_array(op['operating_distance']),
+        _as_float_array(vehicle_fuel_efficiency),
+        _as_float_array(op['refrigerant_charge']),
+        _as_float_array(annual_leakage_rate),
+        _as_float_array(refrigerant_gwp_value),
+        _as_float_array(op['number_of_refrigerators']),
+        _as_float_array(op['livestock_count']),
+        _as_float_array(emission_per_unit_livestock),
+        _as_float_array(op['fertilizer_amount']),
+        _as_float_array(emission_per_unit_fertilizer),
+        _as_float_array(op['waste_amount']),
+        _as_float_array(emission_per_unit_waste),
+        _as_float_array(tru_data['tru_power_rating']),
+        _as_float_array(tru_data['average_load_factor']),
+        _as_float_array(tru_data['tru_annual_hours']),
+        _as_float_array(tru_data['tru_plug_in_fraction_of_hours']),
+        _as_float_array(tru_data['co2e_per_kwh_diesel_tru']),
+        _as_float_array(tru_refrigerant_gwp_value),
+        _as_float_array(op['tru_refrigerant_charge']),
+        float(tru_annual_leakage_rate),
+        _as_float_array(op['tru_number_of_vehicle_units']))
+
+    annual_emission_table = pd.DataFrame({
+        'operation_id': op['operation_id'].to_numpy(),
+        'fuel_emissions': fuel_emissions,
+        'vehicle_emissions': vehicle_emissions,
+        'refrigerant_emissions': refrigerant_emissions,
+        'livestock_emissions': livestock_emissions,
+        'fertilizer_emissions': fertilizer_emissions,
+        'waste_emissions': waste_emissions,
+        'tru_emissions': tru_emissions,
+        'total_emissions': total_emissions
+    })
+
     # Set display format to decimal with 2 decimal places
     pd.options.display.float_format = '{:.2f}'.format
-    
-    if errors:
-        print("Errors encountered during calculation:")
-        for error in errors:
-            print(error)
-    
+
     return annual_emission_table
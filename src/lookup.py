@@ -8,8 +8,42 @@ This module provides a robust lookup system with support for:
 - Multiple output formats (DataFrame or list of dictionaries)
 """
 
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+
+def build_index(df, keys, value_cols=None):
+    """
+    Build a hash index over a reference DataFrame for O(1) keyed lookups.
+
+    Where lookup() scans the whole DataFrame with boolean masks on every call,
+    an index built once can be probed with a plain dict .get(). Use this for
+    reference tables that are queried many times with equality criteria.
+
+    Args:
+        df (pd.DataFrame): The reference DataFrame to index.
+        keys (str or list): Column name(s) to index by. Multiple keys produce
+                            tuple-keyed entries.
+        value_cols (list, optional): Columns to keep in the indexed records.
+                                     If None, all non-key columns are kept.
+
+    Returns:
+        dict: Mapping of key (or key tuple) to a dict of the row's values.
+              Duplicate keys keep the first row, matching lookup() semantics.
+
+    Example:
+        >>> gwp_index = build_index(refrigerant_gwp, 'refrigerant_type')
+        >>> gwp_index.get('HFC-32', {}).get('refrigerant_gwp', 0)
+        650
+    """
+    indexed = df.drop_duplicates(subset=keys, keep='first').set_index(keys)
+    if value_cols is not None:
+        indexed = indexed[value_cols]
+    return indexed.to_dict('index')
+
 
 def lookup(df, criteria, output_columns=None, output_format='dictionary_list', fallback_criteria=None):
     """
@@ -26,29 +60,36 @@ def lookup(df, criteria, output_columns=None, output_format='dictionary_list', f
         output_format (str): Desired output format:
                             - 'dataframe': Returns a pandas DataFrame
                             - 'dictionary_list': Returns a list of dictionaries (default)
+                            - 'scalar': Returns the first matched row's
+                              output_columns values as a tuple; zeros if no match
         fallback_criteria (list, optional): List of dictionaries with fallback criteria.
                                            Each dict contains columns to update in the
                                            original criteria if no results are found.
-    
+
     Returns:
-        pd.DataFrame or list: Matching data based on output_format.
-                             Returns empty DataFrame or empty list if no matches found.
-    
+        pd.DataFrame or list or tuple: Matching data based on output_format.
+                             Returns empty DataFrame, empty list, or a tuple of
+                             zeros if no matches found.
+
     Examples:
         >>> # Simple equality lookup
         >>> lookup(df, {'fuel_type': 'Diesel'}, output_columns=['emission_factor'])
         [{'emission_factor': 2.68}]
-        
+
         >>> # Lookup with comparison operator
         >>> lookup(df, {'year': ('>=', 2020)}, output_format='dataframe')
-        
+
         >>> # Lookup with fallback
-        >>> lookup(df, 
+        >>> lookup(df,
         ...        {'state': 'CA', 'year': 2024},
         ...        fallback_criteria=[{'state': 'Any'}])
+
+        >>> # Single-row consumers: unpack scalars directly
+        >>> (factor,) = lookup(df, {'fuel_type': 'Diesel'},
+        ...                    output_columns=['emission_factor'], output_format='scalar')
     """
     try:
-        print(f"lookup called with criteria: {criteria}")
+        logger.debug("lookup called with criteria: %s", criteria)
         
         # Initial search using primary criteria
         result = _perform_lookup(df, criteria, output_columns, output_format)
@@ -60,18 +101,27 @@ def lookup(df, criteria, output_columns=None, output_format='dictionary_list', f
             for criteria_update in fallback_criteria:
                 updated_criteria = criteria.copy()
                 updated_criteria.update(criteria_update)
-                print(f"Applying fallback criteria: {updated_criteria}")
+                logger.debug("Applying fallback criteria: %s", updated_criteria)
                 result = _perform_lookup(df, updated_criteria, output_columns, output_format)
                 if result:
                     return result
         
         # If no results after fallback, return empty result
-        print("No matching data found.")
-        return pd.DataFrame() if output_format == 'dataframe' else []
-        
+        logger.debug("No matching data found.")
+        return _empty_result(output_columns, output_format)
+
     except (KeyError, IndexError, TypeError, ValueError) as e:
-        print(f"Error during lookup: {e}")
-        return pd.DataFrame() if output_format == 'dataframe' else []
+        logger.warning("Error during lookup: %s", e)
+        return _empty_result(output_columns, output_format)
+
+
+def _empty_result(output_columns, output_format):
+    """Return the no-match value for the given output format."""
+    if output_format == 'dataframe':
+        return pd.DataFrame()
+    if output_format == 'scalar':
+        return (0,) * len(output_columns or [])
+    return []
 
 
 def _perform_lookup(df, criteria, output_columns, output_format):
@@ -93,9 +143,19 @@ def _perform_lookup(df, criteria, output_columns, output_format):
     if not isinstance(criteria, dict):
         raise TypeError("Input 'criteria' must be a dictionary.")
     
-    # Initialize mask as True for all rows
-    combined_mask = pd.Series([True] * len(df), index=df.index)
-    
+    # The first criterion's mask seeds the combined mask, so no all-True
+    # array needs to be allocated up front
+    combined_mask = None
+
+    # Fast path: every call site in the calculator uses plain equality
+    # criteria, which need none of the operator dispatch below
+    if all(not isinstance(value, tuple) for value in criteria.values()):
+        for col, value in criteria.items():
+            criteria_mask = df[col] == value
+            combined_mask = criteria_mask if combined_mask is None else combined_mask & criteria_mask
+        matched_rows = df if combined_mask is None else df[combined_mask]
+        return _format_output(matched_rows, output_columns, output_format)
+
     # Apply criteria
     for col, criteria_value in criteria.items():
         if isinstance(criteria_value, tuple):
@@ -128,35 +188,59 @@ def _perform_lookup(df, criteria, output_columns, output_format):
             criteria_mask = df[col] == criteria_value
         
         # Combine with overall mask
-        combined_mask &= criteria_mask
-    
-    # Filter rows
-    matched_rows = df[combined_mask]
-    
+        combined_mask = criteria_mask if combined_mask is None else combined_mask & criteria_mask
+
+    # Filter rows; no criteria means every row matches
+    matched_rows = df if combined_mask is None else df[combined_mask]
+
+    return _format_output(matched_rows, output_columns, output_format)
+
+
+def _format_output(matched_rows, output_columns, output_format):
+    """
+    Shape matched rows into the requested output format.
+
+    Args:
+        matched_rows (pd.DataFrame): Rows that satisfied the criteria.
+        output_columns (list): List of column names to include in output.
+        output_format (str): Desired output format.
+
+    Returns:
+        pd.DataFrame or list: Matching data based on output_format.
+    """
     if output_format == 'dataframe':
         # Return DataFrame
         if output_columns is None:
-            print(f"lookup returning: {matched_rows}")
+            logger.debug("lookup returning: %s", matched_rows)
             return matched_rows
         else:
             if any(isinstance(col, slice) for col in output_columns):
-                print(f"lookup returning columns: {matched_rows.loc[:, output_columns]}")
+                logger.debug("lookup returning columns: %s", matched_rows.loc[:, output_columns])
                 return matched_rows.loc[:, output_columns]
             else:
-                print(f"lookup returning columns: {matched_rows[output_columns]}")
+                logger.debug("lookup returning columns: %s", matched_rows[output_columns])
                 return matched_rows[output_columns]
     
     elif output_format == 'dictionary_list':
         # Return list of dictionaries
-        intervention_data = []
-        if matched_rows.shape[0] > 0:
-            for _, row in matched_rows.iterrows():
-                if output_columns is None:
-                    intervention_data.append(row.to_dict())
-                else:
-                    intervention_data.append({key: row[key] for key in output_columns})
-        print(f"lookup returning: {intervention_data}")
+        if output_columns is None:
+            intervention_data = matched_rows.to_dict('records')
+        else:
+            intervention_data = matched_rows[output_columns].to_dict('records')
+        logger.debug("lookup returning: %s", intervention_data)
         return intervention_data
-    
+
+    elif output_format == 'scalar':
+        # Return the first matched row's values as a plain tuple, with no
+        # per-row dict construction; None signals a miss to the fallback logic
+        if matched_rows.empty:
+            return None
+        first_row = matched_rows.iloc[0]
+        columns = output_columns if output_columns is not None else matched_rows.columns
+        scalars = tuple(first_row[col] for col in columns)
+        logger.debug("lookup returning: %s", scalars)
+        return scalars
+
     else:
-        raise ValueError("Invalid 'output_format' specified. Use 'dataframe' or 'dictionary_list'.")
+        raise ValueError(
+            "Invalid 'output_format' specified. Use 'dataframe', 'dictionary_list', or 'scalar'.")